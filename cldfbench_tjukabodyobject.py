@@ -1,15 +1,22 @@
 import collections
+import concurrent.futures
+import functools
+import gc
+import hashlib
 import itertools
+import json
+import operator
+import os
 import pathlib
+import pickle
 import re
+import shutil
+import tempfile
 import unicodedata
+import urllib.request
 
-import pycldf
 from cldfbench import CLDFSpec
 from cldfbench import Dataset as BaseDataset
-from cltoolkit import Wordlist
-from cldfzenodo import oai_lexibank
-from git import Repo, GitCommandError
 
 COLLECTIONS = {
     'ClicsCore': (
@@ -20,8 +27,11 @@ COLLECTIONS = {
 CONDITIONS = {
     "ClicsCore": lambda x: len(x.concepts) >= 250,
 }
+ZENODO_API = 'https://zenodo.org/api/records/{}'
+ZENODO_TIMEOUT = 60
 
 
+@functools.lru_cache(maxsize=None)
 def slug(s):
     res = ''.join(
         c.lower()
@@ -53,30 +63,32 @@ def make_cldf_collection(collection, contributions):
     }
 
 
-def language_id(lang):
-    return lang.glottocode or lang.id
+_LANGUAGE_ATTRS = operator.attrgetter(
+    'id', 'name', 'glottocode', 'dataset', 'latitude', 'longitude', 'subgroup', 'family')
 
 
-def make_cldf_lang(lang, collection):
+def make_cldf_lang(lang, collection, forms):
+    id_, name, glottocode, dataset, latitude, longitude, subgroup, family = \
+        _LANGUAGE_ATTRS(lang)
     return {
-        "ID": language_id(lang),
-        "Name": lang.name,
-        "Glottocode": lang.glottocode,
-        "Dataset": lang.dataset,
-        "Latitude": lang.latitude,
-        "Longitude": lang.longitude,
-        "Subgroup": lang.subgroup,
-        "Family": lang.family,
-        "Forms": len(lang.forms or []),
+        "ID": glottocode or id_,
+        "Name": name,
+        "Glottocode": glottocode,
+        "Dataset": dataset,
+        "Latitude": latitude,
+        "Longitude": longitude,
+        "Subgroup": subgroup,
+        "Family": family,
+        "Forms": len(forms),
         "Concepts": len(lang.concepts),
-        "Incollections": collection,
+        "Incollections": {collection},
     }
 
 
-def make_form(form):
+def make_form(form, lang_id):
     return {
         'ID': form.id,
-        'Language_ID': language_id(form.language),
+        'Language_ID': lang_id,
         'Form': form.form,
         'Concepticon_Gloss': form.concept.concepticon_gloss,
     }
@@ -86,9 +98,277 @@ def code_id(feat_id, val):
     return '{}-{}'.format(feat_id, val)
 
 
+def zenodo_release_tag(doi):
+    """Look up the tag of the GitHub release archived under a Zenodo `doi`."""
+    record_id = doi.rpartition('zenodo.')[2]
+    with urllib.request.urlopen(
+            ZENODO_API.format(record_id), timeout=ZENODO_TIMEOUT) as res:
+        record = json.loads(res.read().decode('utf8'))
+    for rel in record['metadata'].get('related_identifiers', []):
+        match = re.match(
+            r'https?://github\.com/[^/]+/[^/]+/tree/(?P<tag>.+)$', rel['identifier'])
+        if match:
+            return match.group('tag')
+    return None
+
+
+def fetch_repository(clone_url, dest, tag=None):
+    """
+    Clone a repository to `dest` or fetch changes if it already exists.
+
+    If the `tag` of a release is given, only the commit of that release is
+    fetched.
+    """
+    from git import Repo, GitCommandError
+
+    if dest.exists():
+        # Only repositories cloned shallow are fetched shallow, so that full
+        # clones stay complete.
+        shallow = (dest / '.git' / 'shallow').exists()
+        for remote in Repo(str(dest)).remotes:
+            if tag:
+                remote.fetch(
+                    'refs/tags/{0}:refs/tags/{0}'.format(tag),
+                    **({'depth': 1} if shallow else {}))
+            else:
+                # A clone of a single tag has no refspec for the branches, so
+                # request them explicitly (and the history they need).
+                remote.fetch(
+                    '+refs/heads/*:refs/remotes/{}/*'.format(remote.name),
+                    **({'unshallow': True} if shallow else {}))
+        return
+
+    if tag:
+        try:
+            Repo.clone_from(
+                clone_url, str(dest), depth=1, branch=tag, single_branch=True)
+            return
+        except GitCommandError:
+            # e.g. the tag is missing on GitHub, so fall back to a full clone
+            if dest.exists():
+                shutil.rmtree(str(dest))
+    # Only the tree of the checked-out revision is ever read, so blobs of
+    # older revisions are not worth downloading.
+    Repo.clone_from(clone_url, str(dest), multi_options=['--filter=blob:none'])
+
+
+def sync_repository(clone_url, dest, doi):
+    """
+    Download a dataset repository and check out its release.
+
+    Returns a list of `(level, message)` pairs for the caller to log.
+    """
+    from git import Repo, GitCommandError
+
+    log = []
+
+    tag = None
+    if doi:
+        try:
+            tag = zenodo_release_tag(doi)
+        except (OSError, ValueError, KeyError) as e:
+            # Without the tag we cannot tell which release to check out, so
+            # leave the dataset alone rather than moving it to another version.
+            log.append(('error', 'could not look up Zenodo record, skipping\n{}'.format(
+                str(e))))
+            return log
+
+    # download data
+    if dest.exists():
+        log.append(('info', "dataset already exists.  pulling changes."))
+    else:
+        log.append(('info', "cloning {}".format(clone_url)))
+    try:
+        fetch_repository(clone_url, dest, tag)
+    except GitCommandError as e:
+        log.append(('error', "download failed\n{}".format(str(e))))
+        return log
+
+    # check out release (fall back to main or master branch)
+    repo = Repo(str(dest))
+    try:
+        if tag:
+            log.append(('info', 'checking out tag {}'.format(tag)))
+            repo.git.checkout(tag)
+        else:
+            log.append(('warning', 'could not determine tag to check out'))
+            remote = repo.remotes[0]
+            remote_branches = {ref.remote_head for ref in remote.refs}
+            for branch in ('main', 'master'):
+                if branch in remote_branches:
+                    log.append(('info', 'checking out {}'.format(branch)))
+                    # (re)create the local branch at the fetched remote head,
+                    # which also works for clones that lack local branches
+                    repo.git.checkout(
+                        '-B', branch, '{}/{}'.format(remote.name, branch))
+                    break
+            else:
+                log.append(('error', 'found neither main nor master branch'))
+    except GitCommandError as e:
+        log.append(('error', "checkout failed\n{}".format(str(e))))
+    return log
+
+
+def index_forms(forms, bodyparts, objects):
+    """Index the forms of one language and count their body-object colexifications."""
+    forms_by_concept = {}
+    form_index = {}
+    for form in forms:
+        gloss = form['Concepticon_Gloss']
+        phon = form['Form']
+        forms_by_concept.setdefault(gloss, set()).add(phon)
+        form_index[gloss, phon] = form['ID']
+
+    glosses_by_form = collections.defaultdict(set)
+    for gloss, phons in forms_by_concept.items():
+        for phon in phons:
+            glosses_by_form[phon].add(gloss)
+
+    colexifications = collections.Counter(
+        (bodyp, obj)
+        for glosses in glosses_by_form.values()
+        for bodyp in glosses
+        if bodyp in bodyparts
+        for obj in glosses
+        if obj in objects)
+    return forms_by_concept, form_index, colexifications
+
+
+def links_concepts(dataset, concepts):
+    """Check whether the ParameterTable of `dataset` links to any of `concepts`."""
+    for row in dataset.iter_rows('ParameterTable'):
+        if 'Concepticon_Gloss' not in row:
+            # without Concepticon glosses we cannot tell
+            return True
+        if row['Concepticon_Gloss'] in concepts:
+            return True
+    return False
+
+
+def load_dataset(dataset_id, metadata, bodyparts, objects, collection):
+    """
+    Extract the contribution, the qualifying languages and their indexed forms
+    from one lexibank dataset.
+    """
+    # pycldf and cltoolkit are slow to import, so only load them when needed
+    import pycldf
+    from cltoolkit import Wordlist
+
+    concepts = bodyparts | objects
+    dataset = pycldf.Dataset.from_metadata(metadata)
+    # building the wordlist is expensive, so skip datasets we have no use for
+    if not links_concepts(dataset, concepts):
+        return None, [], ['{}: no body or object concepts, skipping'.format(dataset_id)]
+    wordlist = Wordlist(datasets=[dataset])
+    condition = CONDITIONS[collection]
+
+    contribution = {
+        'ID': dataset_id,
+        'Name': dataset.properties['dc:title'],
+        'Citation': dataset.properties['dc:bibliographicCitation'],
+        'Collection_IDs': [collection],
+        'Glottocodes': len({
+            l.glottocode
+            for l in wordlist.languages
+            if l.glottocode}),
+        'Doculects': len(wordlist.languages),
+        'Concepts': len(wordlist.concepts),
+        'Senses': len(wordlist.senses),
+        'Forms': len(wordlist.forms),
+    }
+
+    def _valid_form(form):
+        return form.concept and form.concept.concepticon_gloss in concepts
+
+    languages = []
+    warnings = []
+    for lang in wordlist.languages:
+        if not condition(lang):
+            continue
+        elif not lang.name or lang.name == 'None':
+            warnings.append('{0.dataset}: {0.id}: {0.name}'.format(lang))
+            continue
+        elif not lang.latitude:
+            continue
+        all_forms = lang.forms or []
+        cldf_lang = make_cldf_lang(lang, collection, all_forms)
+        lang_forms = [
+            make_form(f, cldf_lang['ID']) for f in all_forms if _valid_form(f)]
+        forms_by_concept, form_index, colexifications = index_forms(
+            lang_forms, bodyparts, objects)
+        languages.append({
+            'language': cldf_lang,
+            'forms': lang_forms,
+            'forms_by_concept': forms_by_concept,
+            'form_index': form_index,
+            'colexifications': colexifications,
+        })
+
+    return contribution, languages, warnings
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash():
+    """Hash of this module's code, so that caches do not outlive code changes."""
+    return hashlib.md5(pathlib.Path(__file__).read_bytes()).hexdigest()
+
+
+def load_dataset_cached(dataset_id, metadata, bodyparts, objects, collection):
+    """Like `load_dataset`, but pickle the result next to the CLDF metadata."""
+    import pycldf
+    import cltoolkit
+
+    metadata = pathlib.Path(metadata)
+    cache = metadata.parent / '.cache.pkl'
+    stamp = (
+        code_hash(),
+        pycldf.__version__,
+        cltoolkit.__version__,
+        sorted(
+            (p.name, p.stat().st_size, p.stat().st_mtime)
+            for p in metadata.parent.iterdir()
+            if not p.name.startswith(cache.stem)),
+        sorted(bodyparts),
+        sorted(objects),
+        collection)
+    if cache.exists():
+        try:
+            with cache.open('rb') as f:
+                cached_stamp, data = pickle.load(f)
+        except Exception:
+            # unpickling a broken cache may fail in many ways: treat it as a miss
+            cached_stamp = None
+        if cached_stamp == stamp:
+            return data
+    data = load_dataset(dataset_id, metadata, bodyparts, objects, collection)
+    gc.collect()
+    # Write to a temporary file first, so that an interrupted run cannot leave
+    # a truncated cache behind.
+    fd, tmp = tempfile.mkstemp(dir=str(cache.parent), prefix=cache.stem, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((stamp, data), f)
+        os.replace(tmp, str(cache))
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return data
+
+
 class Dataset(BaseDataset):
     dir = pathlib.Path(__file__).parent
     id = 'tjukabodyobject'
+    _dataset_meta = None
+
+    @property
+    def dataset_meta(self):
+        """Rows of `etc/datasets.tsv`, keyed by dataset ID."""
+        if self._dataset_meta is None:
+            self._dataset_meta = collections.OrderedDict(
+                (row['ID'], row)
+                for row in self.etc_dir.read_csv(
+                    'datasets.tsv', delimiter='\t', dicts=True))
+        return self._dataset_meta
 
     def cldf_specs(self):
         return CLDFSpec(
@@ -96,55 +376,20 @@ class Dataset(BaseDataset):
             dir=self.cldf_dir, module="StructureDataset")
 
     def cmd_download(self, args):
-        github_info_by_doi = {rec.doi: rec.github_repos for rec in oai_lexibank()}
-        dataset_list = self.etc_dir.read_csv(
-            'datasets.tsv', delimiter='\t', dicts=True)
-
-        for row in dataset_list:
-            dataset_id = row['ID']
-            doi = row['Zenodo']
-            github_org = row['Organisation']
-            github_repo = row['Repository']
-            clone_url = 'https://github.com/{}/{}'.format(
-                github_org, github_repo)
-            if row.get('Zenodo'):
-                tag = github_info_by_doi[doi].tag
-            else:
-                tag = None
-            args.log.info("Checking {}".format(dataset_id))
-            dest = self.raw_dir / dataset_id
-
-            # download data
-            if dest.exists():
-                args.log.info("... dataset already exists.  pulling changes.")
-                for remote in Repo(str(dest)).remotes:
-                    remote.fetch()
-            else:
-                args.log.info("... cloning {}".format(dataset_id))
-                try:
-                    Repo.clone_from(clone_url, str(dest))
-                except GitCommandError as e:
-                    args.log.error("... download failed\n{}".format(str(e)))
-                    continue
-
-            # check out release (fall back to master branch)
-            repo = Repo(str(dest))
-            if tag:
-                args.log.info('... checking out tag {}'.format(tag))
-                repo.git.checkout(tag)
-            else:
-                args.log.warning('... could not determine tag to check out')
-                args.log.info('... checking out master')
-                try:
-                    branch = repo.branches.main
-                    branch.checkout()
-                except AttributeError:
-                    try:
-                        branch = repo.branches.master
-                        branch.checkout()
-                    except AttributeError:
-                        args.log.error('found neither main nor master branch')
-                repo.git.merge()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            jobs = {}
+            for dataset_id, row in self.dataset_meta.items():
+                args.log.info("Checking {}".format(dataset_id))
+                clone_url = 'https://github.com/{}/{}'.format(
+                    row['Organisation'], row['Repository'])
+                future = executor.submit(
+                    sync_repository, clone_url, self.raw_dir / dataset_id, row['Zenodo'])
+                jobs[future] = dataset_id
+
+            # log the messages of each dataset together, as soon as it is done
+            for future in concurrent.futures.as_completed(jobs):
+                for level, message in future.result():
+                    getattr(args.log, level)('{}: {}'.format(jobs[future], message))
 
     def _schema(self, writer):
         writer.cldf.add_component(
@@ -199,102 +444,64 @@ class Dataset(BaseDataset):
     def cmd_makecldf(self, args):
         # Read data
 
-        concept_list = self.etc_dir.read_csv(
-            'Tjuka-2022-784.tsv', dicts=True, delimiter='\t')
-        bodyparts = [
-            row['CONCEPTICON_GLOSS']
-            for row in concept_list
-            if row['GROUP'] == 'body']
-        objects = [
-            row['CONCEPTICON_GLOSS']
-            for row in concept_list
-            if row['GROUP'] == 'object']
-
-        condition = CONDITIONS["ClicsCore"]  # lambda l: len(l.concepts) >= 250
-        collection = 'ClicsCore'
+        concepts_by_group = collections.defaultdict(list)
+        for row in self.etc_dir.read_csv(
+                'Tjuka-2022-784.tsv', dicts=True, delimiter='\t'):
+            concepts_by_group[row['GROUP']].append(row['CONCEPTICON_GLOSS'])
+        bodyparts = concepts_by_group['body']
+        objects = concepts_by_group['object']
 
-        the_concepts_we_want = set(itertools.chain(bodyparts, objects))
+        collection = 'ClicsCore'
 
         form_counts = {}
-        forms_by_language = collections.defaultdict(list)
         languages = collections.OrderedDict()
         contributions = []
 
-        dataset_list = self.etc_dir.read_csv(
-            'datasets.tsv', delimiter='\t', dicts=True)
-
-        for dataset_info in dataset_list:
-            dataset_id = dataset_info['ID']
-            dataset = pycldf.Dataset.from_metadata(
-                self.raw_dir / dataset_id / "cldf" / "cldf-metadata.json")
-            wordlist = Wordlist(datasets=[dataset])
-
-            contributions.append({
-                'ID': dataset_id,
-                'Name': dataset.properties['dc:title'],
-                'Citation': dataset.properties['dc:bibliographicCitation'],
-                'Collection_IDs': [collection],
-                'Glottocodes': len({
-                    l.glottocode
-                    for l in wordlist.languages
-                    if l.glottocode}),
-                'Doculects': len(wordlist.languages),
-                'Concepts': len(wordlist.concepts),
-                'Senses': len(wordlist.senses),
-                'Forms': len(wordlist.forms),
-            })
-
-            def _valid_language(lang):
-                if not lang.name or lang.name == 'None':
-                    args.log.warning('{0.dataset}: {0.id}: {0.name}'.format(lang))
-                    return False
-                elif not lang.latitude or not condition(lang):
-                    return False
-                else:
-                    return True
-
-            def _valid_form(form):
-                return form.concept and form.concept.concepticon_gloss in the_concepts_we_want
-
-            ds_languages = []
-            for lang in wordlist.languages:
-                if not _valid_language(lang):
-                    continue
-                lang_forms = [
-                    make_form(f) for f in lang.forms if _valid_form(f)]
-                if lang.glottocode and len(lang_forms) < form_counts.get(lang.glottocode, 0):
-                    continue
-                ds_languages.append(lang)
-                forms_by_language[language_id(lang)] = lang_forms
-                if lang.glottocode:
-                    form_counts[lang.glottocode] = len(lang_forms)
-
-            languages.update(
-                (language_id(lang), make_cldf_lang(lang, collection))
-                for lang in ds_languages)
+        # Results are merged in the order of etc/datasets.tsv, which decides
+        # between varieties with the same glottocode.
+        dataset_ids = list(self.dataset_meta)
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = executor.map(
+                load_dataset_cached,
+                dataset_ids,
+                [self.raw_dir / dataset_id / "cldf" / "cldf-metadata.json"
+                 for dataset_id in dataset_ids],
+                itertools.repeat(set(bodyparts)),
+                itertools.repeat(set(objects)),
+                itertools.repeat(collection))
+
+            for contribution, ds_languages, warnings in results:
+                for warning in warnings:
+                    args.log.warning(warning)
+                if contribution:
+                    contributions.append(contribution)
+
+                for lang in ds_languages:
+                    lang_id = lang['language']['ID']
+                    glottocode = lang['language']['Glottocode']
+                    if glottocode and len(lang['forms']) < form_counts.get(glottocode, 0):
+                        languages[lang_id]['language']['Incollections'] |= \
+                            lang['language']['Incollections']
+                        continue
+                    if not glottocode and lang_id in languages:
+                        args.log.warning('{}: {}: replaces variety from {}'.format(
+                            lang['language']['Dataset'],
+                            lang_id,
+                            languages[lang_id]['language']['Dataset']))
+                    if lang_id in languages:
+                        lang['language']['Incollections'] |= \
+                            languages[lang_id]['language']['Incollections']
+                    languages[lang_id] = lang
+                    if glottocode:
+                        form_counts[glottocode] = len(lang['forms'])
 
         cldf_colls = [make_cldf_collection(collection, contributions)]
 
         # Process data
 
-        forms_by_concept = collections.defaultdict(set)
-        for lang_forms in forms_by_language.values():
-            for form in lang_forms:
-                lang_id = form['Language_ID']
-                gloss = form['Concepticon_Gloss']
-                forms_by_concept[lang_id, gloss].add(form['Form'])
-
-        colexifications = collections.defaultdict(set)
-        for (lang_id, gloss), _forms in forms_by_concept.items():
-            for form in _forms:
-                colexifications[lang_id, form].add(gloss)
-
-        colex_counter = collections.Counter(
-            (bodyp, obj)
-            for glosses in colexifications.values()
-            for bodyp in glosses
-            for obj in glosses
-            if bodyp in bodyparts and obj in objects)
+        colex_counter = collections.Counter()
+        for lang in languages.values():
+            colex_counter.update(lang.pop('colexifications'))
 
         # TODO maybe adding concepticon ids to the feature table might be useful
         features = [
@@ -326,59 +533,59 @@ class Dataset(BaseDataset):
                     f['Bodypart'], f['Object'])),
                 ('None', "missing value"))]
 
-        def _colex_value(lang_id, bodyp, obj):
-            if not forms_by_concept[lang_id, bodyp] or not forms_by_concept[lang_id, obj]:
+        def _colex_value(bodyp_forms, obj_forms):
+            if not bodyp_forms or not obj_forms:
                 return 'None'
-            elif forms_by_concept[lang_id, bodyp] & forms_by_concept[lang_id, obj]:
+            elif not bodyp_forms.isdisjoint(obj_forms):
                 return 'True'
             else:
                 return 'False'
 
-        form_index = collections.defaultdict(list)
-        for lang_forms in forms_by_language.values():
-            for form in lang_forms:
-                lang_id = form['Language_ID']
-                gloss = form['Concepticon_Gloss']
-                phon = form['Form']
-                form_index[lang_id, gloss, phon] = form['ID']
-        values = [
-            {
-                'ID': '{}-{}'.format(lang['ID'], feat['ID']),
-                'Language_ID': lang['ID'],
-                'Parameter_ID': feat['ID'],
-                'Value': _colex_value(lang['ID'], feat['Bodypart'], feat['Object']),
-                'Code_ID': code_id(
-                    feat['ID'],
-                    _colex_value(lang['ID'], feat['Bodypart'], feat['Object'])),
-                'Example_IDs': sorted(
-                    form_index[lang['ID'], concept, form]
-                    for concept in (feat['Bodypart'], feat['Object'])
-                    for form in forms_by_concept[lang['ID'], concept]),
-            }
-            for lang in languages.values()
+        values = []
+        languages_with_data = set()
+        feature_concepts = [
+            (
+                feat['ID'],
+                feat['Bodypart'],
+                feat['Object'],
+                {val: code_id(feat['ID'], val) for val in ('True', 'False', 'None')},
+            )
             for feat in features]
-
-        languages_with_data = collections.Counter(
-            val['Language_ID']
-            for val in values
-            if val.get('Value', 'None') != 'None')
-        language_table = [
+        for lang in languages.values():
+            lang_id = lang['language']['ID']
+            forms_by_concept = lang.pop('forms_by_concept')
+            form_index = lang.pop('form_index')
+            lang_values = []
+            for feat_id, bodyp, obj, feat_codes in feature_concepts:
+                bodyp_forms = forms_by_concept.get(bodyp, ())
+                obj_forms = forms_by_concept.get(obj, ())
+                value = _colex_value(bodyp_forms, obj_forms)
+                lang_values.append({
+                    'ID': '{}-{}'.format(lang_id, feat_id),
+                    'Language_ID': lang_id,
+                    'Parameter_ID': feat_id,
+                    'Value': value,
+                    'Code_ID': feat_codes[value],
+                    'Example_IDs': sorted(
+                        [form_index[bodyp, form] for form in bodyp_forms]
+                        + [form_index[obj, form] for form in obj_forms]),
+                })
+            if sum(val['Value'] != 'None' for val in lang_values) >= 20:
+                languages_with_data.add(lang_id)
+                values.extend(lang_values)
+
+        languages = [
             lang
-            for lang in languages.values()
-            if languages_with_data.get(lang['ID'], 0) >= 20]
-        values = [
-            val
-            for val in values
-            if languages_with_data.get(val['Language_ID'], 0) >= 20]
+            for lang_id, lang in languages.items()
+            if lang_id in languages_with_data]
+        language_table = [lang['language'] for lang in languages]
+        for lang in language_table:
+            lang['Incollections'] = ' '.join(sorted(lang['Incollections']))
 
         remaining_concepts = {
             concept
             for feature in features
             for concept in (feature['Bodypart'], feature['Object'])}
-        forms_by_language = {
-            lang_id: forms
-            for lang_id, forms in forms_by_language.items()
-            if languages_with_data.get(lang_id, 0) >= 20}
         example_table = [
             {
                 'ID': form['ID'],
@@ -386,8 +593,8 @@ class Dataset(BaseDataset):
                 'Primary_Text': form['Form'],
                 'Translated_Text': form['Concepticon_Gloss'],
             }
-            for lang_forms in forms_by_language.values()
-            for form in lang_forms
+            for lang in languages
+            for form in lang['forms']
             if form['Concepticon_Gloss'] in remaining_concepts]
 
         # Write CLDF data